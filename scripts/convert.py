@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Offline step: convert the dashboard CSVs to columnar files so the app
+# doesn't have to re-parse text and infer dtypes on every cold start.
+# Run from the repository root: python scripts/convert.py
+
+def convert_outbreak_data():
+    """Write the global outbreak data to an uncompressed Arrow (Feather v2) file."""
+    df = pd.read_csv('./globalDiseaseOutbreaks/Outbreaks.csv').drop(columns='Unnamed: 0')
+
+    # Columns the dashboard filters and counts on are stored dictionary-encoded and load as categories
+    for column in ['Country', 'Disease', 'icd10c', 'icd11c1']:
+        df[column] = df[column].astype('category')
+
+    # Left uncompressed so the app can memory-map it; compressed buffers would be decoded into private memory
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(table, './globalDiseaseOutbreaks/Outbreaks.arrow', compression='uncompressed')
+
+def convert_infectious_cases_data():
+    """Write the infectious cases data to Feather (Arrow IPC)."""
+    # The CSV's 'date' column is just a string copy of Year; the app filters on Year directly
+    df = pd.read_csv('infectiouscases.csv').drop(columns=['Unnamed: 0', 'date'])
+
+    # Stored dictionary-encoded, so it loads as a category and entity lookups compare codes
+    df['Entity'] = df['Entity'].astype('category')
+
+    # Store narrow dtypes so the app loads them as-is; halves the bytes the case scans move
+    case_columns = df.columns[3:]
+    df[case_columns] = df[case_columns].astype(np.float32)
+    df['Year'] = df['Year'].astype(np.int32)
+
+    feather.write_feather(df, 'infectiouscases.feather', compression='zstd')
+
+if __name__ == '__main__':
+    convert_outbreak_data()
+    convert_infectious_cases_data()
@@ -1,6 +1,10 @@
+import datetime
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
+import pyarrow.feather as feather
 
 # Set up tabs in Streamlit
 st.set_page_config(
@@ -8,93 +12,134 @@ st.set_page_config(
     page_icon=':microbe:',
 )
 
+# Default range for the infectious cases date inputs
+DEFAULT_START = datetime.date(1920, 1, 1)
+DEFAULT_END = datetime.date(2020, 12, 31)
+
 # Load the dataset
-@st.cache_data
+# The columnar files are generated from the CSVs by scripts/convert.py.
+# The frames are cached as shared resources (no pickling/hashing per rerun), so callers must not mutate them.
+@st.cache_resource
 def load_outbreak_data():
-    df = pd.read_csv('./globalDiseaseOutbreaks/Outbreaks.csv').drop(columns='Unnamed: 0')
-    df['date'] = pd.to_datetime(df['Year'].astype(str) + "-01-01")  # Convert year to datetime
-    return df
-
-@st.cache_data
+    # Memory-mapped; split_blocks=True keeps Year as a view on the mapped buffer instead of
+    # consolidating it into a pandas-owned block. String columns are only views with pandas >= 3
+    # (Arrow-backed str dtype); older pandas copies them into Python objects. The dictionary
+    # columns load as categories either way.
+    table = feather.read_table('./globalDiseaseOutbreaks/Outbreaks.arrow', memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+@st.cache_resource
 def load_infectious_cases_data():
-    return pd.read_csv('infectiouscases.csv')
-
-def load_data():
-    """Load and process global infectious disease outbreak data."""
-    # Load data
-    df = pd.read_csv('./globalDiseaseOutbreaks/Outbreaks.csv').drop(columns='Unnamed: 0')
-
-    # Convert year to datetime for easier filtering
-    df['date'] = pd.to_datetime(df['Year'].astype(str) + "-01-01")  # Assume January 1st as date
-
-    return df
-
-def calculate_outbreak_trends(df, countries, start_date, end_date):
-    """Calculate statistics on infectious disease outbreaks for selected countries and date range."""
-    df_filtered = df[
-        (df['Country'].isin(countries)) & 
-        (df['date'] >= start_date) & 
-        (df['date'] <= end_date)
+    return pd.read_feather('infectiouscases.feather')
+
+# The leading underscore keeps Streamlit from hashing the frame; results are keyed on the filters
+@st.cache_data(ttl=3600, show_spinner=False)
+def calculate_outbreak_trends(_df, countries, start_year, end_year):
+    """Calculate statistics on infectious disease outbreaks for selected countries and year range."""
+    # Country is categorical: flag the selected category codes in a lookup table and index it
+    # with the per-row codes. The extra trailing False entry is what missing values (code -1) hit.
+    country = _df['Country'].cat
+    selected_codes = country.categories.get_indexer(countries)
+    is_selected = np.zeros(len(country.categories) + 1, dtype=bool)
+    is_selected[selected_codes[selected_codes >= 0]] = True
+
+    df_filtered = _df[
+        is_selected[country.codes.to_numpy()] & 
+        _df['Year'].between(start_year, end_year).to_numpy()
     ]
     
-    # Calculate metrics
-    total_unique_outbreaks = df_filtered['Disease'].nunique()
-    unique_diseases_list = df_filtered['Disease'].unique()
-    frequency_of_each_disease = df_filtered['Disease'].value_counts().to_dict()
+    # Calculate metrics; nunique and the unique list fall out of the one value_counts pass.
+    # Disease is categorical, so drop the zero counts of categories outside the selection.
+    disease_counts = df_filtered['Disease'].value_counts()
+    disease_counts = disease_counts[disease_counts > 0]
+    total_unique_outbreaks = len(disease_counts)
+    unique_diseases_list = disease_counts.index
     icd10_categories_count = df_filtered['icd10c'].nunique()
     icd11_categories_count = df_filtered['icd11c1'].nunique()
     
-    yearly_outbreak_trend = df_filtered.groupby(df_filtered['date'].dt.year).size().to_dict()
+    # observed=True skips empty category groups; sort=False since the chart orders by year itself
+    yearly_outbreak_trend = df_filtered.groupby('Year', observed=True, sort=False).size().rename('Outbreaks').reset_index()
 
     return {
         "total_unique_outbreaks": total_unique_outbreaks,
         "unique_diseases_list": list(unique_diseases_list),
-        "frequency_of_each_disease (years)": frequency_of_each_disease,
+        "frequency_of_each_disease (years)": disease_counts,
         "icd10_categories_count": icd10_categories_count,
         "icd11_categories_count": icd11_categories_count,
         "yearly_outbreak_trend": yearly_outbreak_trend
     }
 
-# Load data
-outbreaks_df = load_data()
+# The map shows all outbreaks regardless of the filters, so this only runs once
+@st.cache_data
+def count_outbreaks_by_country(_df):
+    """Count outbreaks per country over the full dataset."""
+    return _df.groupby('Country', observed=True, sort=False).size().reset_index(name='Outbreaks')
 
-# Define a function to calculate infectious case trends
-def calculate_infectious_cases_trends(df, entity, start_date, end_date, disease_condition):
-    start_date = pd.to_datetime(start_date)  # Convert to datetime
-    end_date = pd.to_datetime(end_date)      # Convert to datetime
+# Widget options only depend on the loaded data, so scan for them once
+@st.cache_data
+def outbreak_meta(_df):
+    """Return the country options and the min/max year for the outbreak filters."""
+    return _df['Country'].unique().tolist(), int(_df['Year'].min()), int(_df['Year'].max())
 
+@st.cache_data
+def infectious_cases_entities(_df):
+    """Return the entity options for the infectious cases analysis."""
+    return _df['Entity'].unique().tolist()
+
+# Define a function to calculate infectious case trends
+@st.cache_data(ttl=3600, show_spinner=False)
+def calculate_infectious_cases_trends(_df, entity, start_date, end_date, disease_condition):
+    """Calculate infectious case statistics for an entity and date range; yearly trends stay Year-indexed pandas objects."""
+    # The date inputs are datetime.date values; only their years matter for yearly data
     start_year = start_date.year
     end_year = end_date.year
 
-    df['date'] = pd.to_datetime(df['Year'].astype(str) + "-01-01")
-
-    df_filtered = df[(df['Entity'] == entity) & (df['date'] >= start_date) & (df['date'] <= end_date)]
+    # Data is yearly, so compare on the integer Year instead of building a date column
+    df_filtered = _df[(_df['Entity'] == entity) & (_df['Year'].between(start_year, end_year))]
 
+    # Select the case columns once and reuse them for every aggregate below
     if disease_condition:
         if disease_condition not in df_filtered.columns:
             raise ValueError(f"Disease condition '{disease_condition}' not found in the dataset.")
-        total_cases_per_disease = {disease_condition: df_filtered[disease_condition].sum(skipna=True)}
+        cases = df_filtered[disease_condition]
+        total_cases_per_disease = {disease_condition: np.nansum(cases.to_numpy(), dtype=np.float64)}
         total_cases_overall = total_cases_per_disease[disease_condition]
-        missing_data_per_disease = {disease_condition: df_filtered[disease_condition].isna().sum()}
+        missing_data_per_disease = {disease_condition: cases.isna().sum()}
     else:
-        total_cases_per_disease = df_filtered.iloc[:, 3:].sum(numeric_only=True, skipna=True).to_dict()
+        # Pull the case columns into one contiguous float matrix and get the totals
+        # and missing counts from a single NaN mask instead of separate scans.
+        # Cases are stored as float32; accumulate the totals in float64.
+        case_columns = df_filtered.columns[3:]
+        cases = df_filtered[case_columns].to_numpy(dtype=np.float32, na_value=np.nan)
+        nan_mask = np.isnan(cases)
+        total_cases_per_disease = dict(zip(case_columns, np.where(nan_mask, 0, cases).sum(axis=0, dtype=np.float64).tolist()))
         total_cases_overall = sum(total_cases_per_disease.values())
-        missing_data_per_disease = df_filtered.iloc[:, 3:].isna().sum().to_dict()
+        missing_data_per_disease = dict(zip(case_columns, nan_mask.sum(axis=0).tolist()))
 
-    all_years = set(range(start_year, end_year + 1))
-    missing_years = all_years.difference(set(df_filtered['Year']))
-    missing_data_flag = len(missing_years) > 0
+    # Mark the years present in a bool array over [start_year, end_year]; the gaps are the missing years.
+    # df_filtered is already restricted to that range, so every offset is in bounds.
+    present = np.zeros(max(end_year - start_year + 1, 0), dtype=bool)
+    present[df_filtered['Year'].to_numpy() - start_year] = True
+    missing_years = (np.flatnonzero(~present) + start_year).tolist()
+    missing_data_flag = not present.all()
 
+    # Group only the case columns, not the Entity/Code string columns. The trend stays a
+    # Year-indexed Series/DataFrame so it can be charted without a dict round-trip.
     if disease_condition:
-        yearly_disease_trends = df_filtered.groupby('Year')[disease_condition].sum().to_dict()
+        yearly_disease_trends = cases.groupby(df_filtered['Year'], observed=True, sort=False).sum()
     else:
-        yearly_disease_trends = df_filtered.groupby('Year').sum(numeric_only=True).to_dict(orient='index')
+        yearly_disease_trends = (
+            pd.DataFrame(cases, columns=case_columns)
+            .groupby(df_filtered['Year'].to_numpy(), observed=True, sort=False)
+            .sum()
+            .rename_axis('Year')
+        )
 
     return {
         "total_cases_per_disease": total_cases_per_disease,
         "total_cases_overall": total_cases_overall,
         "missing_data_flag": missing_data_flag,
-        "missing_years": list(missing_years),
+        "missing_years": missing_years,
         "missing_data_per_disease": missing_data_per_disease,
         "yearly_disease_trends": yearly_disease_trends
     }
@@ -102,6 +147,9 @@ def calculate_infectious_cases_trends(df, entity, start_date, end_date, disease_
 # Load data
 outbreaks_df = load_outbreak_data()
 infectiouscases = load_infectious_cases_data()
+country_outbreak_counts = count_outbreaks_by_country(outbreaks_df)
+countries, min_year, max_year = outbreak_meta(outbreaks_df)
+entities = infectious_cases_entities(infectiouscases)
 
 tab1, tab2 = st.tabs(["Global Outbreak Dashboard", "Infectious Disease Trend Analysis"])
 
@@ -114,9 +162,6 @@ with tab1:
         You can filter by country and time range to explore trends and visualize data over time.
     """)
 
-    min_year = int(outbreaks_df['Year'].min())
-    max_year = int(outbreaks_df['Year'].max())
-
     start_year, end_year = st.slider(
         "Select time range",
         min_value=min_year,
@@ -124,7 +169,6 @@ with tab1:
         value=[min_year, max_year]
     )
 
-    countries = outbreaks_df['Country'].unique()
     selected_countries = st.multiselect(
         "Select countries of interest",
         countries,
@@ -136,18 +180,13 @@ with tab1:
     else:
         outbreak_stats = calculate_outbreak_trends(
             outbreaks_df, 
-            countries=selected_countries, 
-            start_date=f"{start_year}-01-01", 
-            end_date=f"{end_year}-12-31"
+            countries=tuple(sorted(selected_countries)),  # Canonical, hashable cache key
+            start_year=start_year, 
+            end_year=end_year
         )
 
-        yearly_trend_df = pd.DataFrame({
-            "Year": list(outbreak_stats['yearly_outbreak_trend'].keys()),
-            "Outbreaks": list(outbreak_stats['yearly_outbreak_trend'].values())
-        })
-
         st.header("Outbreak Trend Over Time")
-        st.line_chart(yearly_trend_df, x='Year', y='Outbreaks')
+        st.line_chart(outbreak_stats['yearly_outbreak_trend'], x='Year', y='Outbreaks')
 
         cols = st.columns(4)
 
@@ -163,7 +202,6 @@ with tab1:
         with cols[3]:
             st.metric("Countries Selected", len(selected_countries))
 
-        country_outbreak_counts = outbreaks_df.groupby("Country").size().reset_index(name='Outbreaks')
         fig = px.choropleth(
             country_outbreak_counts,
             locations="Country",
@@ -177,8 +215,9 @@ with tab1:
         st.plotly_chart(fig)
 
         st.header("Frequency of Each Disease")
-        disease_counts_df = pd.DataFrame(list(outbreak_stats["frequency_of_each_disease (years)"].items()), columns=["Disease", "Count"])
-        st.dataframe(disease_counts_df)
+        st.dataframe(
+            outbreak_stats["frequency_of_each_disease (years)"].rename_axis("Disease").reset_index(name="Count")
+        )
 
 # --------------------------------------------------------------------
 # Tab 2: Infectious Disease Trend Analysis
@@ -186,10 +225,10 @@ with tab2:
     st.title("Infectious Disease Trend Analysis")
     st.write("Select parameters to analyze trends for infectious diseases.")
 
-    entity = st.selectbox("Select Entity", options=infectiouscases['Entity'].unique(), index=0)
+    entity = st.selectbox("Select Entity", options=entities, index=0)
 
-    start_date = st.date_input("Select Start Date", value=pd.to_datetime("1920-01-01").date())
-    end_date = st.date_input("Select End Date", value=pd.to_datetime("2020-12-31").date())
+    start_date = st.date_input("Select Start Date", value=DEFAULT_START)
+    end_date = st.date_input("Select End Date", value=DEFAULT_END)
 
     disease_condition = st.selectbox("Select Disease Condition", options=['All'] + [
         'polio', 'guinea worm', 'rabies', 'malaria', 'hiv/aids', 'tuberculosis', 'smallpox', 'cholera'
@@ -211,7 +250,7 @@ with tab2:
             st.write(result['total_cases_per_disease'])
 
             st.write("### Yearly Trends")
-            st.line_chart(pd.DataFrame(result['yearly_disease_trends']).transpose())
+            st.line_chart(result['yearly_disease_trends'])
         
         except Exception as e:
             st.error(f"Error: {str(e)}")
\ No newline at end of file
@@ -22,7 +22,10 @@ def load_data():
     return df
 
 def calculate_outbreak_trends(df, countries, start_date, end_date):
-    """Calculate statistics on infectious disease outbreaks for selected countries and date range."""
+    """Calculate statistics on infectious disease outbreaks for selected countries and date range.
+
+    Returns the filtered frame along with the statistics so callers can reuse it.
+    """
     df_filtered = df[
         (df['Country'].isin(countries)) & 
         (df['date'] >= start_date) & 
@@ -38,7 +41,7 @@ def calculate_outbreak_trends(df, countries, start_date, end_date):
     
     yearly_outbreak_trend = df_filtered.groupby(df_filtered['date'].dt.year).size().to_dict()
 
-    return {
+    return df_filtered, {
         "total_unique_outbreaks": total_unique_outbreaks,
         "unique_diseases_list": list(unique_diseases_list),
         "frequency_of_each_disease (years)": frequency_of_each_disease,
@@ -81,16 +84,9 @@ selected_countries = st.multiselect(
 if not selected_countries:
     st.warning("Please select at least one country.")
 
-# Filter the data based on user selections
-filtered_outbreaks_df = outbreaks_df[
-    (outbreaks_df['Country'].isin(selected_countries)) & 
-    (outbreaks_df['Year'] >= start_year) & 
-    (outbreaks_df['Year'] <= end_year)
-]
-
-# Calculate outbreak statistics
+# Filter the data and calculate outbreak statistics based on user selections
 if selected_countries:
-    outbreak_stats = calculate_outbreak_trends(
+    filtered_outbreaks_df, outbreak_stats = calculate_outbreak_trends(
         outbreaks_df, 
         countries=selected_countries, 
         start_date=f"{start_year}-01-01", 